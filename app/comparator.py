@@ -1,11 +1,10 @@
 # comparator.py
+import json
 import logging
-import google.generativeai as genai
+from llm_client import get_model
 from config import GEMINI_API_KEY, SUMMARY_TEMPERATURE, COMPARATIVE_MAX_TOKENS
-
-class APILimitError(Exception):
-    """Error personalizado para límites de API y otros errores de Gemini"""
-    pass
+from profile_extractor import PROFILE_FIELDS
+from summarizer import APILimitError
 
 def compare_insurance_companies(resumen1, resumen2, nombre_cia1, nombre_cia2):
     """
@@ -28,16 +27,11 @@ def compare_insurance_companies(resumen1, resumen2, nombre_cia1, nombre_cia2):
     if not GEMINI_API_KEY:
         raise ValueError("GEMINI_API_KEY no encontrada en variables de entorno")
         
-    genai.configure(api_key=GEMINI_API_KEY)
-    
     # Configurar modelo
-    model = genai.GenerativeModel(
-        model_name="gemini-1.5-pro",
-        generation_config={
-            "temperature": SUMMARY_TEMPERATURE,
-            "max_output_tokens": COMPARATIVE_MAX_TOKENS,
-        }
-    )
+    model = get_model({
+        "temperature": SUMMARY_TEMPERATURE,
+        "max_output_tokens": COMPARATIVE_MAX_TOKENS,
+    })
     
     # Crear prompt para la comparación
     prompt = f"""
@@ -85,4 +79,96 @@ def compare_insurance_companies(resumen1, resumen2, nombre_cia1, nombre_cia2):
         return response.text
     except Exception as e:
         logging.error(f"Error al generar análisis comparativo con Gemini API: {e}")
-        raise APILimitError("Error al comunicarse con la API de Gemini. Posiblemente se alcanzó el límite de uso.")
\ No newline at end of file
+        raise APILimitError("Error al comunicarse con la API de Gemini. Posiblemente se alcanzó el límite de uso.")
+
+def _celda_tabla(items):
+    """Formatea una lista de puntos del perfil como celda de tabla markdown"""
+    if not items:
+        return "Sin información en el sitio"
+    # Un salto de línea dentro de la celda cortaría la fila de la tabla
+    return "<br>".join(f"• {' '.join(str(item).split())}".replace("|", "\\|") for item in items)
+
+def build_comparison_table(perfil1, perfil2, nombre_cia1, nombre_cia2):
+    """
+    Arma localmente la tabla comparativa a partir de los perfiles estructurados.
+    
+    Returns:
+        Tabla en formato markdown con una fila por categoría de PROFILE_FIELDS
+    """
+    filas = [
+        f"| Categoría | {nombre_cia1} | {nombre_cia2} |",
+        "|---|---|---|"
+    ]
+    for campo, categoria in PROFILE_FIELDS.items():
+        filas.append(
+            f"| **{categoria}** | {_celda_tabla(perfil1.get(campo))} | {_celda_tabla(perfil2.get(campo))} |"
+        )
+    return "\n".join(filas)
+
+def compare_insurance_profiles(perfil1, perfil2, nombre_cia1, nombre_cia2):
+    """
+    Compara dos compañías de seguros a partir de sus perfiles estructurados.
+    
+    La tabla comparativa se arma localmente; Gemini solo redacta las secciones
+    narrativas, recibiendo los perfiles compactos en lugar de los resúmenes completos.
+    
+    Args:
+        perfil1: Perfil de la primera compañía (ver profile_extractor.extract_profile)
+        perfil2: Perfil de la segunda compañía
+        nombre_cia1: Nombre de la primera compañía
+        nombre_cia2: Nombre de la segunda compañía
+        
+    Returns:
+        Análisis comparativo en formato markdown
+        
+    Raises:
+        APILimitError: Si hay problemas con la API de Gemini
+    """
+    logging.info(f"Iniciando comparación por perfiles entre {nombre_cia1} y {nombre_cia2}")
+    
+    if not GEMINI_API_KEY:
+        raise ValueError("GEMINI_API_KEY no encontrada en variables de entorno")
+        
+    # Configurar modelo
+    model = get_model({
+        "temperature": SUMMARY_TEMPERATURE,
+        "max_output_tokens": COMPARATIVE_MAX_TOKENS,
+    })
+    
+    tabla = build_comparison_table(perfil1, perfil2, nombre_cia1, nombre_cia2)
+    
+    # Perfiles en JSON compacto para reducir tokens
+    prompt = f"""
+    Necesito un análisis comparativo entre dos compañías de seguros argentinas: {nombre_cia1} y {nombre_cia2}.
+    
+    IMPORTANTE: Este análisis debe basarse EXCLUSIVAMENTE en los perfiles extraídos de los sitios web oficiales de ambas compañías. No debes incorporar conocimiento externo sobre estas aseguradoras.
+    
+    Perfil de {nombre_cia1}: {json.dumps(perfil1, ensure_ascii=False, separators=(',', ':'))}
+    Perfil de {nombre_cia2}: {json.dumps(perfil2, ensure_ascii=False, separators=(',', ':'))}
+    
+    La tabla comparativa ya está armada; NO la repitas. Redacta únicamente estas secciones:
+    
+    ## 2. Fortalezas y debilidades: Analiza las principales fortalezas y debilidades de cada compañía respecto a su competidora.
+    
+    ## 3. Recomendaciones: En qué casos conviene elegir una u otra compañía según:
+       - Perfil del cliente (particular, empresa, profesional)
+       - Tipo de cobertura necesitada
+       - Preferencias de servicio (digital vs tradicional)
+    
+    ## 4. Conclusiones: Síntesis final de la comparativa con los puntos más relevantes.
+    
+    ## 5. Limitaciones del análisis: Incluye un párrafo explicando que este análisis está limitado a la información disponible en los sitios web oficiales, y puede no reflejar la experiencia real de los clientes o todas las características y coberturas de cada compañía.
+    
+    Responde en formato markdown bien estructurado, usando negritas y listas para facilitar la lectura.
+    Sé objetivo y equilibrado en tu análisis.
+    """
+    
+    # Generar respuesta
+    logging.info("Generando secciones narrativas de la comparativa")
+    try:
+        response = model.generate_content(prompt)
+        logging.info("Análisis comparativo generado con éxito")
+        return f"## 1. Tabla comparativa\n\n{tabla}\n\n{response.text}"
+    except Exception as e:
+        logging.error(f"Error al generar análisis comparativo con Gemini API: {e}")
+        raise APILimitError("Error al comunicarse con la API de Gemini. Posiblemente se alcanzó el límite de uso.")
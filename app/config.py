@@ -1,17 +1,21 @@
 # config.py
 import os
-import streamlit as st
+import sys
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 # API Keys
-try:
-    GEMINI_API_KEY = st.secrets["GEMINI_API_KEY"]
-except:
-    # Fallback para desarrollo local usando variables de entorno
-    GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+# Streamlit also exposes root-level secrets as environment variables, so the
+# app only needs st.secrets as a fallback. Streamlit is never imported here so
+# CLI and batch runs start without it.
+GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+if not GEMINI_API_KEY and "streamlit" in sys.modules:
+    try:
+        GEMINI_API_KEY = sys.modules["streamlit"].secrets["GEMINI_API_KEY"]
+    except Exception:
+        pass
 
 # Web Scraping Settings
 DEFAULT_USER_AGENT = 'Mozilla/5.0'
@@ -20,6 +24,17 @@ MAX_PAGES = 100
 MAX_WORKERS = 2
 CONTENT_SEPARATOR = "\n\n"
 
+# HTTP Transport
+ASEGURADORAS_FILE = "app/data/aseguradoras.json"
+HTTP_MAX_HOSTS = 32  # Hosts with pooled connections kept open at once
+HTTP2_ENABLED = False  # Requires httpx[http2]; falls back to HTTP/1.1 otherwise
+
+# Response Limits
+MAX_RESPONSE_BYTES = 2 * 1024 * 1024  # Cap on decoded body size per page
+STREAM_CHUNK_SIZE = 64 * 1024
+ALLOWED_CONTENT_TYPES = ['text/html', 'application/xhtml+xml']
+ENCODING_SNIFF_BYTES = 4096  # Bytes scanned for a <meta charset> declaration
+
 # Link Filtering
 EXCLUDE_PATTERNS = [
     # Archivos multimedia y documentos
@@ -38,12 +53,27 @@ EXCLUDE_PATTERNS = [
 
 PRIORITY_PATTERNS = ["/productos", "/seguros", "/coberturas", "/siniestros", "/contacto"]
 
+# Corpus Storage
+CORPUS_DIR = "app/data/corpus"
+CORPUS_COMPRESSION = "zstd"
+
+# Search Index
+SEARCH_INDEX_PATH = "app/data/search_index.db"
+SEARCH_MAX_RESULTS = 50
+SEARCH_SNIPPET_TOKENS = 16
+
 # Summarization Settings
+SUMMARIES_DIR = "app/data/summaries"
 SUMMARY_MAX_TOKENS = 1024
 SUMMARY_TEMPERATURE = 0.2
 SUMMARY_TOP_P = 0.95
 SUMMARY_TOP_K = 40
 
+# Profile Settings
+PROFILES_DIR = "app/data/profiles"
+PROFILE_MAX_TOKENS = 1024
+PROFILE_MAX_ITEMS = 6
+
 # Comparison Settings
 COMPARATIVE_MAX_TOKENS = 4096
 MAX_CHARS_FOR_ANALYSIS = 60000
\ No newline at end of file
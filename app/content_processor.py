@@ -4,15 +4,21 @@ from urllib.parse import urlparse
 import concurrent.futures
 from collections import defaultdict
 from website_extractor import WebsiteExtractor
+from http_transport import get_transport, host_key
 from config import MAX_WORKERS, CONTENT_SEPARATOR
 
 def get_all_pages_content(urls, max_pages=100):
     """Get content from multiple pages in parallel with optimizations"""
+    pages = get_all_pages(urls, max_pages=max_pages)
+    return CONTENT_SEPARATOR.join(page['text'] for page in pages if page['text'])
+
+def get_all_pages(urls, max_pages=100):
+    """Get per-page records (text, links and fetch metadata) from multiple pages in parallel"""
     # Limit to max_pages
     urls = urls[:max_pages]
     
     if not urls:
-        return ""
+        return []
     
     logging.info(f"Processing {len(urls)} URLs")
     
@@ -34,9 +40,10 @@ def get_all_pages_content(urls, max_pages=100):
         try:
             domain = urlparse(url).netloc
             extractor = extractors[domain]
-            return extractor.get_page_content(url)
+            return extractor.get_page_record(url)
         except Exception as e:
-            return ""
+            logging.error(f"Error processing {url}: {e}")
+            return None
     
     # Process URLs in parallel using chunks to control load
     chunk_size = min(10, max_pages)  # Process in chunks of 10 or fewer
@@ -52,11 +59,23 @@ def get_all_pages_content(urls, max_pages=100):
                 url = future_to_url[future]
                 try:
                     result = future.result()
-                    if result:  # Only add successful results
+                    if result:  # Only add pages that produced a record
                         results.append(result)
                 except Exception as e:
                     logging.error(f"Error with {url}: {e}")
     
-    # Combine with separator
-    logging.info(f"Successfully processed {len(results)} pages")
-    return CONTENT_SEPARATOR.join(results)
\ No newline at end of file
+    # Report URLs skipped by the fetcher (content type, size limit, HTTP errors)
+    for domain, extractor in extractors.items():
+        rejected = extractor.rejected_urls
+        if rejected:
+            logging.info(f"Rejected {len(rejected)} URLs for {domain}: {rejected}")
+    
+    # Report connection reuse of the shared transport for the domains crawled
+    stats = get_transport().stats()
+    for domain, extractor in extractors.items():
+        host_stats = stats.get(host_key(extractor.base_url))
+        if host_stats:
+            logging.info(f"Connections for {domain}: {host_stats}")
+    
+    logging.info(f"Successfully processed {sum(1 for page in results if page['text'])} pages")
+    return results
\ No newline at end of file
@@ -0,0 +1,99 @@
+# corpus_store.py
+import os
+import logging
+from urllib.parse import urlparse, urlunparse
+from config import CORPUS_DIR, CORPUS_COMPRESSION, CONTENT_SEPARATOR
+
+CORPUS_COLUMNS = [
+    'insurer_id', 'url', 'fetched_at', 'status', 'content_hash',
+    'byte_size', 'text', 'links'
+]
+
+def canonicalize_url(url):
+    """Normalize a URL so variants of the same page share one record"""
+    parsed = urlparse(url)
+    path = parsed.path.rstrip('/') or '/'
+    return urlunparse((
+        parsed.scheme.lower(), parsed.netloc.lower(), path,
+        parsed.params, parsed.query, ''
+    ))
+
+class CorpusStore:
+    """Crawled pages stored as one compressed Parquet file per insurer"""
+
+    def __init__(self, base_dir=CORPUS_DIR):
+        self.base_dir = base_dir
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def _path(self, insurer_id):
+        return os.path.join(self.base_dir, f"{insurer_id}.parquet")
+
+    def insurers(self):
+        """List the insurers that have stored pages"""
+        return sorted(
+            name[:-len('.parquet')] for name in os.listdir(self.base_dir)
+            if name.endswith('.parquet')
+        )
+
+    def has_pages(self, insurer_id):
+        """True if at least one stored page of the insurer has text"""
+        if not os.path.exists(self._path(insurer_id)):
+            return False
+        pages = self.read(insurer_id, columns=['text'])
+        return bool(pages['text'].fillna('').astype(bool).any())
+
+    def read(self, insurer_id, columns=None):
+        """Read the stored pages of one insurer, optionally only some columns"""
+        import pandas as pd  # Lazy: pandas/pyarrow are only needed when the corpus is used
+        if not os.path.exists(self._path(insurer_id)):
+            return pd.DataFrame(columns=columns or CORPUS_COLUMNS)
+        return pd.read_parquet(self._path(insurer_id), columns=columns)
+
+    def append(self, insurer_id, pages):
+        """
+        Add crawled pages for an insurer, keeping only the latest version of each URL.
+
+        Args:
+            insurer_id: Id of the insurer in aseguradoras.json
+            pages: Records as returned by content_processor.get_all_pages
+
+        Returns:
+            Number of pages stored for the insurer
+        """
+        if not pages:
+            return len(self.read(insurer_id, columns=['url']))
+
+        import pandas as pd
+        new = pd.DataFrame(pages)
+        new['insurer_id'] = insurer_id
+        new['url'] = new['url'].map(canonicalize_url)
+        new['fetched_at'] = pd.to_datetime(new['fetched_at'], utc=True)
+        new['status'] = new['status'].astype('Int64')
+        new['links'] = new['links'].map(list)
+        new = new[CORPUS_COLUMNS]
+
+        if os.path.exists(self._path(insurer_id)):
+            stored = self.read(insurer_id)
+            # A failed fetch (empty text) must not replace a stored version that has text
+            with_text = set(stored.loc[stored['text'].fillna('').astype(bool), 'url'])
+            failed = new['text'].fillna('') == ''
+            new = new[~(failed & new['url'].isin(with_text))]
+            new = pd.concat([stored, new], ignore_index=True)
+
+        # Last occurrence wins, so a recrawl replaces older versions of a page
+        corpus = new.drop_duplicates(subset='url', keep='last').reset_index(drop=True)
+
+        # Write to a temporary file first so an interrupted run keeps the old corpus
+        path = self._path(insurer_id)
+        tmp_path = f"{path}.tmp"
+        corpus.to_parquet(tmp_path, compression=CORPUS_COMPRESSION, index=False)
+        os.replace(tmp_path, path)
+
+        logging.info(f"Stored {len(corpus)} pages for {insurer_id} in {path}")
+        return len(corpus)
+
+    def get_text(self, insurer_id, max_chars=None):
+        """Join the stored text of an insurer the same way get_all_pages_content does"""
+        pages = self.read(insurer_id, columns=['text'])
+        content = CONTENT_SEPARATOR.join(text for text in pages['text'] if text)
+        return content[:max_chars] if max_chars else content
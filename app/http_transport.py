@@ -0,0 +1,251 @@
+# http_transport.py
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from config import (
+    REQUEST_TIMEOUT, MAX_WORKERS, HTTP_MAX_HOSTS, HTTP2_ENABLED,
+    ASEGURADORAS_FILE
+)
+
+# Browser-like headers to avoid blocking. Accept-Encoding is left to the HTTP
+# client, which advertises br (and zstd) only when a decoder is installed.
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def host_key(url_or_host):
+    """
+    Host used for stats, ignoring a leading www.
+
+    An explicit port is kept (local servers on one hostname are different
+    hosts), except the default port of the URL's scheme.
+    """
+    if '//' in url_or_host:
+        parsed = urlparse(url_or_host)
+        host = parsed.netloc.lower().split('@')[-1]
+        hostname, _, port = host.partition(':')
+        if port and DEFAULT_PORTS.get(parsed.scheme.lower()) == int(port):
+            host = hostname
+    else:
+        host = url_or_host.lower().split('@')[-1]
+    return host[4:] if host.startswith('www.') else host
+
+def tls_host(url_or_host):
+    """Host used for TLS settings: host_key without the port"""
+    return host_key(url_or_host).split(':')[0]
+
+def _http2_client_available():
+    try:
+        import httpx  # noqa: F401
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+class TransportResponse:
+    """Minimal response interface shared by the requests and httpx backends"""
+
+    def __init__(self, status_code, headers, chunks):
+        self.status_code = status_code
+        self.headers = headers
+        self._chunks = chunks
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def iter_content(self, chunk_size):
+        return self._chunks(chunk_size)
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report every socket they open"""
+
+    def __init__(self, on_new_connection, **kwargs):
+        # Set before HTTPAdapter.__init__, which builds the pool manager
+        self.on_new_connection = on_new_connection
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        on_new_connection = self.on_new_connection
+
+        def counting(pool_class):
+            scheme = pool_class.scheme
+
+            # urllib3 reconnects a dropped connection object in place (after an
+            # unread body or a keep-alive timeout), so count in connect() rather
+            # than when the pool creates the object
+            class CountingConnection(pool_class.ConnectionCls):
+                def connect(self):
+                    super().connect()
+                    on_new_connection(f"{scheme}://{self.host}:{self.port}")
+
+            class CountingPool(pool_class):
+                ConnectionCls = CountingConnection
+            return CountingPool
+
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: counting(pool_class)
+            for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+class HttpTransport:
+    """
+    Shared HTTP client for every extractor.
+
+    Connection pools are kept per host and sized to MAX_WORKERS so concurrent
+    fetches to one insurer reuse connections. TLS verification can be disabled
+    per host, and request/connection counters are kept per host for stats().
+    """
+
+    def __init__(self, pool_size=MAX_WORKERS, http2=HTTP2_ENABLED, tls_verify=None):
+        self.pool_size = pool_size
+        self.tls_verify = {}
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._connections = {}
+        self._streams = {}
+
+        self.http2 = http2 and _http2_client_available()
+        if http2 and not self.http2:
+            logging.warning("HTTP/2 requested but httpx[http2] is not installed; using HTTP/1.1")
+
+        if self.http2:
+            import httpx
+            limits = httpx.Limits(
+                max_connections=pool_size * HTTP_MAX_HOSTS,
+                max_keepalive_connections=pool_size * HTTP_MAX_HOSTS
+            )
+            self.client = httpx.Client(
+                http2=True, limits=limits, headers=DEFAULT_HEADERS,
+                follow_redirects=True, timeout=REQUEST_TIMEOUT
+            )
+            # TLS settings are fixed per httpx client, so unverified hosts get their own
+            self.insecure_client = httpx.Client(
+                http2=True, limits=limits, headers=DEFAULT_HEADERS,
+                follow_redirects=True, timeout=REQUEST_TIMEOUT, verify=False
+            )
+        else:
+            self.session = requests.Session()
+            self.session.headers.update(DEFAULT_HEADERS)
+            self.adapter = _CountingAdapter(
+                self._count_connection, pool_connections=HTTP_MAX_HOSTS, pool_maxsize=pool_size
+            )
+            self.session.mount('http://', self.adapter)
+            self.session.mount('https://', self.adapter)
+
+        for host, verify in (tls_verify or {}).items():
+            self.set_tls_verify(host, verify)
+
+    def set_tls_verify(self, host, verify):
+        """Enable or disable certificate verification for a host"""
+        key = tls_host(host)
+        self.tls_verify[key] = verify
+        if not verify:
+            logging.warning(f"SSL verification disabled for {key} (verify_ssl: false)")
+
+    def _verify_for(self, url):
+        host = tls_host(url)
+        for key, verify in self.tls_verify.items():
+            if host == key or host.endswith('.' + key):
+                return verify
+        return True
+
+    def _count_request(self, url, stream_id=None):
+        host = host_key(url)
+        with self._lock:
+            self._requests[host] = self._requests.get(host, 0) + 1
+            if stream_id is not None:
+                self._streams.setdefault(host, set()).add(stream_id)
+
+    def _count_connection(self, url):
+        host = host_key(url)
+        with self._lock:
+            self._connections[host] = self._connections.get(host, 0) + 1
+
+    @contextmanager
+    def stream(self, url, timeout=REQUEST_TIMEOUT):
+        """Open a streamed GET request; the body is read through iter_content()"""
+        verify = self._verify_for(url)
+
+        if self.http2:
+            client = self.client if verify else self.insecure_client
+            with client.stream('GET', url, timeout=timeout) as response:
+                stream = response.extensions.get('network_stream')
+                self._count_request(url, id(stream) if stream is not None else None)
+                yield TransportResponse(response.status_code, response.headers, response.iter_bytes)
+            return
+
+        with self.session.get(url, timeout=timeout, stream=True, verify=verify) as response:
+            self._count_request(url)
+            yield TransportResponse(response.status_code, response.headers, response.iter_content)
+
+    def stats(self):
+        """
+        Connection reuse per host.
+
+        Returns:
+            Dict host -> {'requests', 'connections', 'reused'}, keyed by
+            host_key(). connections counts sockets as they are connected, so
+            reconnects and pools evicted from the pool manager are accounted for. With
+            HTTP/2, it counts distinct network streams seen by httpx.
+        """
+        with self._lock:
+            requests_by_host = dict(self._requests)
+            if self.http2:
+                connections = {host: len(ids) for host, ids in self._streams.items()}
+            else:
+                connections = dict(self._connections)
+
+        return {
+            host: {
+                'requests': count,
+                'connections': connections.get(host, 0),
+                'reused': max(count - connections.get(host, 0), 0)
+            }
+            for host, count in requests_by_host.items()
+        }
+
+    def close(self):
+        if self.http2:
+            self.client.close()
+            self.insecure_client.close()
+        else:
+            self.session.close()
+
+def load_tls_settings(path=ASEGURADORAS_FILE):
+    """Read per-insurer verify_ssl settings from aseguradoras.json"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            aseguradoras = json.load(f)
+    except Exception as e:
+        logging.error(f"Error loading TLS settings from {path}: {e}")
+        return {}
+    return {
+        tls_host(aseg['url']): aseg['verify_ssl']
+        for aseg in aseguradoras if 'verify_ssl' in aseg
+    }
+
+_transport = None
+_transport_lock = threading.Lock()
+
+def get_transport():
+    """Process-wide transport shared by all extractors"""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            tls_verify = load_tls_settings()
+            if any(not verify for verify in tls_verify.values()):
+                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            _transport = HttpTransport(tls_verify=tls_verify)
+        return _transport
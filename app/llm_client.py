@@ -0,0 +1,22 @@
+# llm_client.py
+from functools import lru_cache
+from config import GEMINI_API_KEY
+
+@lru_cache(maxsize=None)
+def _configured_genai():
+    """Import and configure the Gemini SDK on first use"""
+    # Imported lazily: the SDK is heavy and only needed when a summary or comparison is generated
+    import google.generativeai as genai
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai
+
+@lru_cache(maxsize=16)
+def _cached_model(model_name, config_items):
+    return _configured_genai().GenerativeModel(
+        model_name=model_name,
+        generation_config=dict(config_items)
+    )
+
+def get_model(generation_config, model_name="gemini-1.5-pro"):
+    """Return a Gemini model, reusing the client for identical configurations"""
+    return _cached_model(model_name, tuple(sorted(generation_config.items())))
@@ -2,15 +2,11 @@ import streamlit as st
 import json
 import os
 import logging
-from website_extractor import WebsiteExtractor
-from content_processor import get_all_pages_content
-from summarizer import summarize_with_gemini
-from comparator import compare_insurance_companies
-from config import MAX_PAGES, MAX_CHARS_FOR_ANALYSIS, COMPARATIVE_MAX_TOKENS
-
-class APILimitError(Exception):
-    """Error personalizado para límites de API y otros errores de Gemini"""
-    pass
+from corpus_store import CorpusStore
+from search_index import SearchIndex
+from summarizer import APILimitError
+from pipeline import leer_resumen, obtener_resumen, generar_comparativa
+from config import ASEGURADORAS_FILE, MAX_CHARS_FOR_ANALYSIS, COMPARATIVE_MAX_TOKENS
 
 # Configuración de logging
 logging.basicConfig(
@@ -19,71 +15,87 @@ logging.basicConfig(
     handlers=[logging.StreamHandler()]
 )
 
+# Los módulos de scraping (requests, bs4, html5lib) y de Gemini se importan dentro
+# de las funciones de pipeline.py, solo cuando falta un resumen, perfil o
+# comparativa guardado, para que el arranque y cada rerun de Streamlit no los carguen.
+
+@st.cache_data
+def _leer_aseguradoras(ruta):
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
 def cargar_aseguradoras():
     """Carga la lista de aseguradoras desde el archivo JSON"""
     try:
-        with open("app/data/aseguradoras.json", "r", encoding="utf-8") as f:
-            return json.load(f)
+        return _leer_aseguradoras(ASEGURADORAS_FILE)
     except Exception as e:
         st.error(f"Error al cargar aseguradoras: {e}")
         return []
 
+@st.cache_resource
+def obtener_corpus():
+    """Almacén de páginas compartido entre sesiones y reruns"""
+    return CorpusStore()
+
+@st.cache_resource
+def obtener_indice():
+    """Índice de búsqueda compartido entre sesiones y reruns"""
+    return SearchIndex()
+
 def procesar_aseguradora(aseguradora, max_chars):
     """Procesa una aseguradora extrayendo y resumiendo su contenido"""
-    nombre = aseguradora["id"]
-    url = aseguradora["url"]
-    
-    # Definir el path del directorio de summaries
-    dir_summaries = "app/data/summaries"
-    
-    # Crear el directorio si no existe
-    if not os.path.exists(dir_summaries):
-        os.makedirs(dir_summaries)
-    
-    # Definir el path del archivo de resumen
-    archivo_resumen = f"{dir_summaries}/resumen_{nombre}.md"
-    
     # Verificar si ya existe un resumen guardado
-    if os.path.exists(archivo_resumen):
+    resumen = leer_resumen(aseguradora)
+    if resumen is not None:
         st.info(f"Resumen de {aseguradora['nombre']} ya existente, cargando...")
-        with open(archivo_resumen, 'r', encoding='utf-8') as f:
-            return f.read()
+        return resumen
     
     # Mostrar progreso
     progress_placeholder = st.empty()
     status_text = st.empty()
     
-    # Extraer y procesar
-    status_text.text(f"Extrayendo enlaces de {aseguradora['nombre']}...")
-    extractor = WebsiteExtractor(url)
-    extractor.extract_links()
-    progress_placeholder.progress(20)
+    def progreso(porcentaje, mensaje):
+        if porcentaje is not None:
+            progress_placeholder.progress(porcentaje)
+        status_text.text(mensaje)
     
-    status_text.text(f"Filtrando enlaces de {aseguradora['nombre']}...")
-    filtered_links = extractor.filter_links()
-    progress_placeholder.progress(30)
-    
-    status_text.text(f"Extrayendo contenido de {aseguradora['nombre']}...")
-    content = get_all_pages_content(filtered_links, max_pages=MAX_PAGES)
-    progress_placeholder.progress(70)
-    
-    status_text.text(f"Generando resumen de {aseguradora['nombre']}...")
     try:
-        summary = summarize_with_gemini(content[:max_chars])
-        progress_placeholder.progress(100)
-        
-        # Guardar resumen
-        with open(archivo_resumen, 'w', encoding='utf-8') as f:
-            f.write(summary)
-        
-        status_text.text(f"Procesamiento de {aseguradora['nombre']} completado.")
-        return summary
+        return obtener_resumen(
+            aseguradora, max_chars, obtener_corpus(), obtener_indice(), progreso=progreso
+        )
     except APILimitError as e:
         progress_placeholder.empty()
         status_text.empty()
         st.error(f"⚠️ {str(e)} Por favor, espera unos minutos e intenta nuevamente.")
         return None
 
+def mostrar_busqueda(aseguradoras):
+    """Búsqueda de texto completo sobre el contenido descargado de las aseguradoras"""
+    nombres = {aseg["id"]: aseg["nombre"] for aseg in aseguradoras}
+    indice = obtener_indice()
+    
+    st.markdown("Busca términos en las páginas ya descargadas de todas las aseguradoras, sin consultar a Gemini.")
+    if st.button("Actualizar índice", type="secondary"):
+        with st.spinner("Indexando páginas almacenadas..."):
+            actualizadas = indice.index_corpus(obtener_corpus())
+        st.success(f"Índice actualizado: {actualizadas} páginas nuevas o modificadas.")
+    
+    consulta = st.text_input("Buscar", placeholder="granizo, cobertura de cristales, app móvil...")
+    if not consulta:
+        return
+    
+    resultados = indice.insurers_matching(consulta)
+    if not resultados:
+        st.info(f"Ninguna aseguradora menciona \"{consulta}\" en las páginas indexadas.")
+        return
+    
+    st.write(f"{len(resultados)} aseguradoras mencionan **{consulta}**:")
+    for resultado in resultados:
+        nombre = nombres.get(resultado["insurer_id"], resultado["insurer_id"])
+        with st.expander(f"{nombre} ({resultado['matches']} páginas)"):
+            for hit in resultado["hits"]:
+                st.markdown(f"[{hit['url']}]({hit['url']})  \n{hit['snippet']}")
+
 def main():
     st.set_page_config(
         page_title="Web Insurance Analyzer",
@@ -145,83 +157,91 @@ def main():
         comparar_btn = st.button("Comparar Aseguradoras", use_container_width=True)
         reset_btn = st.button("Nuevo Análisis", type="secondary", use_container_width=True)
     
-    # Lógica para resetear archivos de comparación
-    if reset_btn:
-        # Obtener las compañías seleccionadas
-        cia1 = next((a for a in aseguradoras if a["id"] == cia1_id), None)
-        cia2 = next((a for a in aseguradoras if a["id"] == cia2_id), None)
-        
-        if cia1 and cia2:
-            # Eliminar archivo de comparativa si existe
+    tab_comparar, tab_buscar = st.tabs(["Comparar", "Buscar"])
+    
+    with tab_buscar:
+        mostrar_busqueda(aseguradoras)
+    
+    with tab_comparar:
+        # Lógica para resetear archivos de comparación
+        if reset_btn:
+            # Obtener las compañías seleccionadas
+            cia1 = next((a for a in aseguradoras if a["id"] == cia1_id), None)
+            cia2 = next((a for a in aseguradoras if a["id"] == cia2_id), None)
+            
+            if cia1 and cia2:
+                # Eliminar archivo de comparativa si existe
+                archivo_comparativa = f"comparativa_{cia1_id}_{cia2_id}.md"
+                if os.path.exists(archivo_comparativa):
+                    try:
+                        os.remove(archivo_comparativa)
+                        st.success(f"Comparativa entre {cia1['nombre']} y {cia2['nombre']} eliminada. Puedes generar una nueva.")
+                    except Exception as e:
+                        st.error(f"Error al eliminar comparativa: {e}")
+        
+        # Iniciar comparación
+        if comparar_btn:
+            # Encontrar las aseguradoras seleccionadas
+            cia1 = next((a for a in aseguradoras if a["id"] == cia1_id), None)
+            cia2 = next((a for a in aseguradoras if a["id"] == cia2_id), None)
+            
+            if not cia1 or not cia2:
+                st.error("Error al seleccionar aseguradoras.")
+                return
+            
+            st.subheader("Procesando información")
+            
+            # Procesar aseguradoras
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write(f"Procesando {cia1['nombre']}...")
+                resumen1 = procesar_aseguradora(cia1, max_chars)
+                if resumen1 is None:
+                    st.stop()  # Detener la ejecución si hay un error de API
+            
+            with col2:
+                st.write(f"Procesando {cia2['nombre']}...")
+                resumen2 = procesar_aseguradora(cia2, max_chars)
+                if resumen2 is None:
+                    st.stop()  # Detener la ejecución si hay un error de API
+            
+            # Comparar
+            st.subheader("Generando comparativa...")
             archivo_comparativa = f"comparativa_{cia1_id}_{cia2_id}.md"
+            
+            # Verificar si ya existe la comparativa
             if os.path.exists(archivo_comparativa):
-                try:
-                    os.remove(archivo_comparativa)
-                    st.success(f"Comparativa entre {cia1['nombre']} y {cia2['nombre']} eliminada. Puedes generar una nueva.")
-                except Exception as e:
-                    st.error(f"Error al eliminar comparativa: {e}")
-    
-    # Iniciar comparación
-    if comparar_btn:
-        # Encontrar las aseguradoras seleccionadas
-        cia1 = next((a for a in aseguradoras if a["id"] == cia1_id), None)
-        cia2 = next((a for a in aseguradoras if a["id"] == cia2_id), None)
-        
-        if not cia1 or not cia2:
-            st.error("Error al seleccionar aseguradoras.")
-            return
-        
-        st.subheader("Procesando información")
-        
-        # Procesar aseguradoras
-        col1, col2 = st.columns(2)
-        with col1:
-            st.write(f"Procesando {cia1['nombre']}...")
-            resumen1 = procesar_aseguradora(cia1, max_chars)
-            if resumen1 is None:
-                st.stop()  # Detener la ejecución si hay un error de API
-        
-        with col2:
-            st.write(f"Procesando {cia2['nombre']}...")
-            resumen2 = procesar_aseguradora(cia2, max_chars)
-            if resumen2 is None:
-                st.stop()  # Detener la ejecución si hay un error de API
-        
-        # Comparar
-        st.subheader("Generando comparativa...")
-        archivo_comparativa = f"comparativa_{cia1_id}_{cia2_id}.md"
-        
-        # Verificar si ya existe la comparativa
-        if os.path.exists(archivo_comparativa):
-            st.info("Cargando comparativa existente...")
-            with open(archivo_comparativa, 'r', encoding='utf-8') as f:
-                comparativa = f.read()
-        else:
-            with st.spinner("Generando nuevo análisis comparativo..."):
-                try:
-                    comparativa = compare_insurance_companies(
-                        resumen1, resumen2, cia1["nombre"], cia2["nombre"]
-                    )
-                    
-                    # Guardar la comparativa en un archivo para futuras consultas
-                    with open(archivo_comparativa, 'w', encoding='utf-8') as f:
-                        f.write(comparativa)
-                except APILimitError as e:
-                    st.error(f"⚠️ {str(e)} Por favor, espera unos minutos e intenta nuevamente.")
-                    st.stop()
-        
-        # Mostrar resultados
-        st.markdown("---")
-        st.markdown("<h2 style='text-align: center;'>Análisis Comparativo</h2>", unsafe_allow_html=True)
-        st.markdown(comparativa)
-        
-        # Opción para descargar
-        st.download_button(
-            label="Descargar Comparativa",
-            data=comparativa,
-            file_name=f"comparativa_{cia1_id}_{cia2_id}.md",
-            mime="text/markdown"
-        )
+                st.info("Cargando comparativa existente...")
+                with open(archivo_comparativa, 'r', encoding='utf-8') as f:
+                    comparativa = f.read()
+            else:
+                with st.spinner("Generando nuevo análisis comparativo..."):
+                    try:
+                        # Comparar por perfiles compactos; si falta alguno, usar los resúmenes completos
+                        comparativa, con_perfiles = generar_comparativa(cia1, resumen1, cia2, resumen2)
+                        
+                        # Guardar la comparativa en un archivo para futuras consultas. La hecha
+                        # con los resúmenes por un perfil inválido no se guarda, así la próxima
+                        # ejecución vuelve a intentar con perfiles.
+                        if con_perfiles:
+                            with open(archivo_comparativa, 'w', encoding='utf-8') as f:
+                                f.write(comparativa)
+                    except APILimitError as e:
+                        st.error(f"⚠️ {str(e)} Por favor, espera unos minutos e intenta nuevamente.")
+                        st.stop()
+            
+            # Mostrar resultados
+            st.markdown("---")
+            st.markdown("<h2 style='text-align: center;'>Análisis Comparativo</h2>", unsafe_allow_html=True)
+            st.markdown(comparativa)
+            
+            # Opción para descargar
+            st.download_button(
+                label="Descargar Comparativa",
+                data=comparativa,
+                file_name=f"comparativa_{cia1_id}_{cia2_id}.md",
+                mime="text/markdown"
+            )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,141 @@
+# pipeline.py
+import os
+import json
+import hashlib
+import logging
+from config import MAX_PAGES, CONTENT_SEPARATOR, SUMMARIES_DIR, PROFILES_DIR
+
+# Flujo resumen -> perfil -> comparativa sin Streamlit, compartido por la app
+# (main.py) y los benchmarks. Los módulos de scraping y de Gemini se importan
+# dentro de las funciones, solo cuando falta un resultado guardado.
+
+def _guardar(ruta, texto):
+    """Escribe primero en un archivo temporal, para no dejar un archivo a medias si se interrumpe"""
+    tmp_path = f"{ruta}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(texto)
+    os.replace(tmp_path, ruta)
+
+def _archivo_resumen(aseguradora, dir_resumenes):
+    return os.path.join(dir_resumenes, f"resumen_{aseguradora['id']}.md")
+
+def leer_resumen(aseguradora, dir_resumenes=SUMMARIES_DIR):
+    """Devuelve el resumen guardado de la aseguradora, o None si no existe"""
+    archivo_resumen = _archivo_resumen(aseguradora, dir_resumenes)
+    if not os.path.exists(archivo_resumen):
+        return None
+    with open(archivo_resumen, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def obtener_resumen(aseguradora, max_chars, corpus, indice, dir_resumenes=SUMMARIES_DIR, progreso=None):
+    """
+    Devuelve el resumen de una aseguradora, generándolo si no está guardado.
+
+    Usa las páginas del corpus si existen; si no, descarga el sitio y agrega
+    las páginas al corpus y al índice de búsqueda.
+
+    Args:
+        aseguradora: Entrada de aseguradoras.json (id, nombre, url)
+        max_chars: Caracteres de contenido enviados a Gemini
+        corpus: CorpusStore donde se guardan las páginas
+        indice: SearchIndex que se actualiza con las páginas descargadas
+        dir_resumenes: Directorio de los resúmenes guardados
+        progreso: Función opcional progreso(porcentaje, mensaje)
+
+    Raises:
+        APILimitError: Si hay problemas con la API de Gemini
+    """
+    resumen = leer_resumen(aseguradora, dir_resumenes)
+    if resumen is not None:
+        return resumen
+
+    progreso = progreso or (lambda porcentaje, mensaje: None)
+    nombre = aseguradora["id"]
+
+    if corpus.has_pages(nombre):
+        progreso(None, f"Cargando contenido almacenado de {aseguradora['nombre']}...")
+        content = corpus.get_text(nombre)
+    else:
+        from website_extractor import WebsiteExtractor
+        from content_processor import get_all_pages
+
+        progreso(None, f"Extrayendo enlaces de {aseguradora['nombre']}...")
+        extractor = WebsiteExtractor(aseguradora["url"])
+        extractor.extract_links()
+
+        progreso(20, f"Filtrando enlaces de {aseguradora['nombre']}...")
+        filtered_links = extractor.filter_links()
+
+        progreso(30, f"Extrayendo contenido de {aseguradora['nombre']}...")
+        pages = get_all_pages(filtered_links, max_pages=MAX_PAGES)
+        corpus.append(nombre, pages)
+        indice.add_pages(nombre, pages)
+        content = CONTENT_SEPARATOR.join(page['text'] for page in pages if page['text'])
+
+    progreso(70, f"Generando resumen de {aseguradora['nombre']}...")
+    from summarizer import summarize_with_gemini
+    resumen = summarize_with_gemini(content[:max_chars])
+
+    os.makedirs(dir_resumenes, exist_ok=True)
+    _guardar(_archivo_resumen(aseguradora, dir_resumenes), resumen)
+    progreso(100, f"Procesamiento de {aseguradora['nombre']} completado.")
+    return resumen
+
+def obtener_perfil(aseguradora, resumen, dir_perfiles=PROFILES_DIR):
+    """
+    Obtiene el perfil estructurado de una aseguradora, generándolo una sola vez por resumen.
+
+    Returns:
+        Perfil (ver profile_extractor.PROFILE_FIELDS), o None si Gemini devolvió
+        un perfil inválido y hay que comparar con el resumen completo
+
+    Raises:
+        APILimitError: Si hay problemas con la API de Gemini
+    """
+    nombre = aseguradora["id"]
+    os.makedirs(dir_perfiles, exist_ok=True)
+    archivo_perfil = os.path.join(dir_perfiles, f"perfil_{nombre}.json")
+
+    # El perfil guardado solo es válido para el resumen del que se extrajo
+    hash_resumen = hashlib.sha256(resumen.encode('utf-8')).hexdigest()
+    if os.path.exists(archivo_perfil):
+        try:
+            with open(archivo_perfil, 'r', encoding='utf-8') as f:
+                guardado = json.load(f)
+        except (OSError, ValueError) as e:
+            # Un archivo ilegible o corrupto se trata como si no existiera
+            logging.warning(f"Perfil guardado de {nombre} ilegible, se generará de nuevo: {e}")
+            guardado = None
+        if isinstance(guardado, dict) and guardado.get("summary_hash") == hash_resumen and "perfil" in guardado:
+            return guardado["perfil"]
+
+    from profile_extractor import extract_profile
+    try:
+        perfil = extract_profile(resumen, aseguradora["nombre"])
+    except ValueError as e:
+        # Perfil inválido: se compara con el resumen completo. Los errores de la API
+        # (APILimitError) se propagan a quien llama.
+        logging.warning(f"No se pudo generar el perfil de {nombre}, se usará el resumen completo: {e}")
+        return None
+
+    _guardar(archivo_perfil, json.dumps({"summary_hash": hash_resumen, "perfil": perfil}, ensure_ascii=False, indent=2))
+    return perfil
+
+def generar_comparativa(cia1, resumen1, cia2, resumen2, dir_perfiles=PROFILES_DIR):
+    """
+    Compara dos aseguradoras por sus perfiles compactos, o por los resúmenes
+    completos si falta alguno de los perfiles.
+
+    Returns:
+        Tupla (comparativa, con_perfiles). con_perfiles es False si se usaron los
+        resúmenes completos porque algún perfil fue inválido
+
+    Raises:
+        APILimitError: Si hay problemas con la API de Gemini
+    """
+    from comparator import compare_insurance_companies, compare_insurance_profiles
+    perfil1 = obtener_perfil(cia1, resumen1, dir_perfiles)
+    perfil2 = obtener_perfil(cia2, resumen2, dir_perfiles)
+    if perfil1 and perfil2:
+        return compare_insurance_profiles(perfil1, perfil2, cia1["nombre"], cia2["nombre"]), True
+    return compare_insurance_companies(resumen1, resumen2, cia1["nombre"], cia2["nombre"]), False
@@ -0,0 +1,79 @@
+# profile_extractor.py
+import json
+import logging
+from llm_client import get_model
+from config import GEMINI_API_KEY, SUMMARY_TEMPERATURE, PROFILE_MAX_TOKENS, PROFILE_MAX_ITEMS
+from summarizer import APILimitError
+
+# Campos del perfil, con la categoría de la tabla comparativa que alimentan
+PROFILE_FIELDS = {
+    "productos": "Variedad de productos y coberturas",
+    "servicios_digitales": "Servicios digitales y app",
+    "proceso_siniestros": "Proceso de siniestros",
+    "canales_atencion": "Canales de atención al cliente",
+    "propuesta_valor": "Propuesta de valor única",
+}
+
+def _normalizar_perfil(data):
+    """Asegura que cada campo del perfil sea una lista corta de textos de una línea"""
+    perfil = {}
+    for campo in PROFILE_FIELDS:
+        valor = data.get(campo) if isinstance(data, dict) else None
+        if isinstance(valor, str):
+            valor = [valor]
+        if not isinstance(valor, list):
+            valor = []
+        items = (' '.join(str(item).split()) for item in valor)
+        perfil[campo] = [item for item in items if item][:PROFILE_MAX_ITEMS]
+    return perfil
+
+def extract_profile(resumen, nombre_cia):
+    """
+    Extrae un perfil estructurado y compacto de una aseguradora a partir de su resumen.
+
+    Args:
+        resumen: Resumen en markdown de la compañía
+        nombre_cia: Nombre de la compañía
+
+    Returns:
+        Diccionario con una lista de puntos breves por cada campo de PROFILE_FIELDS
+
+    Raises:
+        APILimitError: Si hay problemas con la API de Gemini
+    """
+    logging.info(f"Extrayendo perfil estructurado de {nombre_cia}")
+
+    if not GEMINI_API_KEY:
+        raise ValueError("GEMINI_API_KEY no encontrada en variables de entorno")
+
+    # Configurar modelo con salida JSON
+    model = get_model({
+        "temperature": SUMMARY_TEMPERATURE,
+        "max_output_tokens": PROFILE_MAX_TOKENS,
+        "response_mime_type": "application/json",
+    })
+
+    campos = "\n".join(f'    - "{campo}": {categoria}' for campo, categoria in PROFILE_FIELDS.items())
+    prompt = f"""
+    A partir del siguiente resumen del sitio web de la aseguradora argentina {nombre_cia}, genera un perfil estructurado.
+
+    Responde ÚNICAMENTE con un objeto JSON con estas claves, cada una con una lista de hasta {PROFILE_MAX_ITEMS} puntos breves (máximo 12 palabras cada uno):
+{campos}
+
+    Usa solo información presente en el resumen. Si no hay información para una clave, usa una lista vacía.
+
+    RESUMEN:
+    {resumen}
+    """
+
+    try:
+        response = model.generate_content(prompt)
+        perfil = _normalizar_perfil(json.loads(response.text))
+        logging.info(f"Perfil de {nombre_cia} generado con éxito")
+        return perfil
+    except json.JSONDecodeError as e:
+        logging.error(f"Respuesta de perfil inválida para {nombre_cia}: {e}")
+        raise ValueError(f"La respuesta de Gemini para el perfil de {nombre_cia} no es un JSON válido")
+    except Exception as e:
+        logging.error(f"Error al generar perfil con Gemini API: {e}")
+        raise APILimitError("Error al comunicarse con la API de Gemini. Posiblemente se alcanzó el límite de uso.")
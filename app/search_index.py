@@ -0,0 +1,197 @@
+# search_index.py
+import os
+import re
+import hashlib
+import logging
+import sqlite3
+import threading
+from corpus_store import canonicalize_url
+from config import SEARCH_INDEX_PATH, SEARCH_MAX_RESULTS, SEARCH_SNIPPET_TOKENS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    insurer_id TEXT NOT NULL,
+    url TEXT NOT NULL UNIQUE,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_insurer ON documents(insurer_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    text, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+def to_fts_query(text):
+    """Turn free text into an FTS5 query where every word must appear"""
+    terms = re.findall(r'\w+', text)
+    return ' '.join(f'"{term}"' for term in terms)
+
+class SearchIndex:
+    """SQLite FTS5 index over the text of crawled insurer pages"""
+
+    def __init__(self, db_path=SEARCH_INDEX_PATH):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # Shared across Streamlit threads; writes are serialized with the lock
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock:
+            self.conn.executescript(SCHEMA)
+
+    def add_pages(self, insurer_id, pages):
+        """
+        Index pages of an insurer, skipping those whose content hash did not change.
+
+        Args:
+            insurer_id: Id of the insurer in aseguradoras.json
+            pages: Records with url, text and optionally content_hash
+
+        Returns:
+            Number of pages added or updated
+        """
+        updated = 0
+        with self.lock, self.conn:
+            for page in pages:
+                text = page.get('text')
+                if not text:
+                    continue
+                url = canonicalize_url(page['url'])
+                content_hash = page.get('content_hash') or hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+                row = self.conn.execute(
+                    "SELECT id, content_hash FROM documents WHERE url = ?", (url,)
+                ).fetchone()
+                if row and row[1] == content_hash:
+                    continue
+
+                if row:
+                    doc_id = row[0]
+                    self.conn.execute(
+                        "UPDATE documents SET insurer_id = ?, content_hash = ? WHERE id = ?",
+                        (insurer_id, content_hash, doc_id)
+                    )
+                    self.conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (doc_id,))
+                else:
+                    doc_id = self.conn.execute(
+                        "INSERT INTO documents (insurer_id, url, content_hash) VALUES (?, ?, ?)",
+                        (insurer_id, url, content_hash)
+                    ).lastrowid
+                self.conn.execute(
+                    "INSERT INTO documents_fts (rowid, text) VALUES (?, ?)", (doc_id, text)
+                )
+                updated += 1
+
+        logging.info(f"Search index: {updated} pages added or updated for {insurer_id}")
+        return updated
+
+    def index_corpus(self, store):
+        """Bring the index up to date with every insurer in a CorpusStore"""
+        updated = 0
+        for insurer_id in store.insurers():
+            pages = store.read(insurer_id, columns=['url', 'content_hash', 'text'])
+            updated += self.add_pages(insurer_id, pages.to_dict('records'))
+        return updated
+
+    def search(self, query, insurer_ids=None, limit=SEARCH_MAX_RESULTS, raw=False):
+        """
+        Search indexed pages and return the best ranked matches.
+
+        Args:
+            query: Words to look for; every word must appear in the page
+            insurer_ids: Optional list of insurers to restrict the search to
+            limit: Maximum number of results (None for all)
+            raw: Pass the query to FTS5 as is (phrases, OR, NEAR, prefix*)
+
+        Returns:
+            List of dicts with insurer_id, url, snippet and score (lower is better)
+        """
+        fts_query = query if raw else to_fts_query(query)
+        if not fts_query:
+            return []
+
+        sql = f"""
+            SELECT d.insurer_id, d.url,
+                   snippet(documents_fts, 0, '**', '**', '…', {int(SEARCH_SNIPPET_TOKENS)}),
+                   bm25(documents_fts) AS score
+            FROM documents_fts
+            JOIN documents d ON d.id = documents_fts.rowid
+            WHERE documents_fts MATCH ?
+        """
+        params = [fts_query]
+        if insurer_ids:
+            sql += f" AND d.insurer_id IN ({', '.join('?' for _ in insurer_ids)})"
+            params.extend(insurer_ids)
+        sql += " ORDER BY score"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        try:
+            with self.lock:
+                rows = self.conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            logging.error(f"Invalid search query {query!r}: {e}")
+            return []
+
+        return [
+            {'insurer_id': insurer_id, 'url': url, 'snippet': snippet, 'score': score}
+            for insurer_id, url, snippet, score in rows
+        ]
+
+    def insurers_matching(self, query, hits_per_insurer=3, raw=False):
+        """
+        Find which insurers mention a query, best ranked insurer first.
+
+        Returns:
+            List of dicts with insurer_id, matches (number of pages) and
+            hits (the best ranked results of that insurer)
+        """
+        fts_query = query if raw else to_fts_query(query)
+        if not fts_query:
+            return []
+
+        # Rank every match without snippets, which are only built for the hits shown
+        ranking_sql = """
+            SELECT insurer_id, COUNT(*) OVER (PARTITION BY insurer_id),
+                   ROW_NUMBER() OVER (PARTITION BY insurer_id ORDER BY score),
+                   id, score
+            FROM (
+                SELECT d.insurer_id, d.id, bm25(documents_fts) AS score
+                FROM documents_fts
+                JOIN documents d ON d.id = documents_fts.rowid
+                WHERE documents_fts MATCH ?
+            )
+            ORDER BY score
+        """
+        snippet_sql = f"""
+            SELECT documents_fts.rowid, d.url,
+                   snippet(documents_fts, 0, '**', '**', '…', {int(SEARCH_SNIPPET_TOKENS)})
+            FROM documents_fts
+            JOIN documents d ON d.id = documents_fts.rowid
+            WHERE documents_fts MATCH ? AND documents_fts.rowid IN ({{}})
+        """
+        try:
+            with self.lock:
+                rows = self.conn.execute(ranking_sql, (fts_query,)).fetchall()
+                top = [row for row in rows if row[2] <= hits_per_insurer]
+                snippets = {}
+                if top:
+                    ids = [row[3] for row in top]
+                    sql = snippet_sql.format(', '.join('?' for _ in ids))
+                    for doc_id, url, snippet in self.conn.execute(sql, [fts_query, *ids]):
+                        snippets[doc_id] = (url, snippet)
+        except sqlite3.OperationalError as e:
+            logging.error(f"Invalid search query {query!r}: {e}")
+            return []
+
+        # Rows arrive ordered by score, so insertion order ranks the insurers
+        grouped = {}
+        for insurer_id, matches, _, doc_id, score in top:
+            entry = grouped.setdefault(
+                insurer_id, {'insurer_id': insurer_id, 'matches': matches, 'hits': []}
+            )
+            url, snippet = snippets[doc_id]
+            entry['hits'].append(
+                {'insurer_id': insurer_id, 'url': url, 'snippet': snippet, 'score': score}
+            )
+        return list(grouped.values())
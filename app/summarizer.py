@@ -1,6 +1,6 @@
 # summarizer.py
 import logging
-import google.generativeai as genai
+from llm_client import get_model
 from config import (
     GEMINI_API_KEY, SUMMARY_MAX_TOKENS, SUMMARY_TEMPERATURE,
     SUMMARY_TOP_P, SUMMARY_TOP_K
@@ -29,18 +29,13 @@ def summarize_with_gemini(content, max_tokens=SUMMARY_MAX_TOKENS):
     if not GEMINI_API_KEY:
         raise ValueError("GEMINI_API_KEY not found in environment variables")
         
-    genai.configure(api_key=GEMINI_API_KEY)
-    
     # Configure model
-    model = genai.GenerativeModel(
-        model_name="gemini-1.5-pro",
-        generation_config={
-            "temperature": SUMMARY_TEMPERATURE,
-            "top_p": SUMMARY_TOP_P,
-            "top_k": SUMMARY_TOP_K,
-            "max_output_tokens": max_tokens,
-        }
-    )
+    model = get_model({
+        "temperature": SUMMARY_TEMPERATURE,
+        "top_p": SUMMARY_TOP_P,
+        "top_k": SUMMARY_TOP_K,
+        "max_output_tokens": max_tokens,
+    })
     
     # Create prompt
     prompt = f"""
@@ -1,35 +1,38 @@
 # website_extractor.py
 import re
 import json
+import codecs
+import hashlib
 import logging
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse, urljoin
+from datetime import datetime, timezone
 from functools import lru_cache
+from http_transport import get_transport
 from config import (
     DEFAULT_USER_AGENT, REQUEST_TIMEOUT, 
-    EXCLUDE_PATTERNS, PRIORITY_PATTERNS
+    EXCLUDE_PATTERNS, PRIORITY_PATTERNS,
+    MAX_RESPONSE_BYTES, STREAM_CHUNK_SIZE, ALLOWED_CONTENT_TYPES,
+    ENCODING_SNIFF_BYTES
 )
 
+# Charset declarations inside <meta charset="..."> or http-equiv content
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_\-:.]+)', re.IGNORECASE)
+
 class WebsiteExtractor:
-    def __init__(self, base_url):
+    def __init__(self, base_url, transport=None):
         self.base_url = base_url
         self.domain = urlparse(base_url).netloc
         self.all_links = []
         self.filtered_links = []
         self.visited_urls = set()
         
-        # Persistent session for connection reuse
-        self.session = requests.Session()
+        # Fetch metadata per URL (status, content type, size, encoding, rejection reason)
+        self.fetch_log = {}
         
-        # Improved headers to avoid blocking
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+        # Shared transport: pooled connections, compression and per-insurer TLS settings
+        self.transport = transport or get_transport()
         
         # Improved URL pattern to avoid capturing invalid URLs
         self.url_pattern = re.compile(r'https?://[^\s\'"<>]+|/[a-zA-Z0-9_\-\.\/]+\.html?')
@@ -38,6 +41,79 @@ class WebsiteExtractor:
         self.exclude_patterns = EXCLUDE_PATTERNS
         self.priority_patterns = PRIORITY_PATTERNS
     
+    @property
+    def rejected_urls(self):
+        """URLs that were not parsed, mapped to the reason they were rejected"""
+        return {url: info['rejected'] for url, info in self.fetch_log.items() if info.get('rejected')}
+    
+    def _reject(self, url, reason, **info):
+        """Record why a URL was not parsed"""
+        self.fetch_log[url] = {'fetched_at': datetime.now(timezone.utc), **info, 'rejected': reason}
+        logging.info(f"Skipping {url}: {reason}")
+    
+    def _detect_encoding(self, content_type, body):
+        """Detect encoding from the Content-Type header or a <meta> tag, defaulting to UTF-8"""
+        candidates = []
+        for param in content_type.split(';')[1:]:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'charset':
+                candidates.append(value.strip().strip('"\''))
+        
+        match = META_CHARSET_PATTERN.search(bytes(body[:ENCODING_SNIFF_BYTES]))
+        if match:
+            candidates.append(match.group(1).decode('ascii', errors='ignore'))
+        
+        for candidate in candidates:
+            try:
+                return codecs.lookup(candidate).name
+            except LookupError:
+                continue
+        return 'utf-8'
+    
+    def _fetch_html(self, url):
+        """Download a page with streamed reads, checking type and size before keeping the body"""
+        fetched_at = datetime.now(timezone.utc)
+        with self.transport.stream(url, timeout=REQUEST_TIMEOUT) as response:
+            status = response.status_code
+            if not response.ok:
+                self._reject(url, f"HTTP {status}", fetched_at=fetched_at, status=status)
+                return None
+            
+            # Check Content-Type before reading the body
+            content_type = response.headers.get('Content-Type', '')
+            mime_type = content_type.split(';')[0].strip().lower()
+            if mime_type and mime_type not in ALLOWED_CONTENT_TYPES:
+                self._reject(url, f"content type {mime_type}",
+                             fetched_at=fetched_at, status=status, content_type=mime_type)
+                return None
+            
+            declared_length = response.headers.get('Content-Length', '')
+            if declared_length.isdigit() and int(declared_length) > MAX_RESPONSE_BYTES:
+                self._reject(url, f"declared size {declared_length} bytes exceeds {MAX_RESPONSE_BYTES}",
+                             fetched_at=fetched_at, status=status, content_type=mime_type)
+                return None
+            
+            # Stream the body and stop as soon as the cap is exceeded
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                body.extend(chunk)
+                if len(body) > MAX_RESPONSE_BYTES:
+                    self._reject(url, f"body exceeds {MAX_RESPONSE_BYTES} bytes",
+                                 fetched_at=fetched_at, status=status, content_type=mime_type)
+                    return None
+        
+        encoding = self._detect_encoding(content_type, body)
+        self.fetch_log[url] = {
+            'fetched_at': fetched_at,
+            'status': status,
+            'content_type': mime_type,
+            'bytes': len(body),
+            'encoding': encoding,
+            'rejected': None
+        }
+        # Decode once and hand text to the parser so it does not re-detect the encoding
+        return body.decode(encoding, errors='replace')
+    
     @lru_cache(maxsize=32)
     def _get_soup(self, url=None):
         """Get BeautifulSoup with cache using lru_cache decorator"""
@@ -45,26 +121,21 @@ class WebsiteExtractor:
             url = self.base_url
             
         try:
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            # Using html5lib for better parsing
-            return BeautifulSoup(response.text, 'html5lib')
+            html = self._fetch_html(url)
         except requests.exceptions.SSLError:
-            # Handle SSL errors for specific domains
-            if any(domain in url for domain in ['galiciaseguros.com.ar', 'integrityseguros.com.ar']):
-                logging.warning(f"SSL verification failed for {url}. Proceeding with verification disabled.")
-                try:
-                    response = self.session.get(url, verify=False, timeout=REQUEST_TIMEOUT)
-                    response.raise_for_status()
-                    return BeautifulSoup(response.text, 'html5lib')
-                except Exception as e:
-                    logging.error(f"Still error fetching {url} with verification disabled: {e}")
-                    return None
+            # Verification can be disabled per insurer with "verify_ssl": false in aseguradoras.json
             logging.error(f"SSL Error fetching {url}")
-            return None 
+            self._reject(url, "SSL error")
+            return None
         except Exception as e:
             logging.error(f"Error fetching {url}: {e}")
+            self._reject(url, f"error: {e}")
+            return None
+        
+        if html is None:
             return None
+        # Using html5lib for better parsing
+        return BeautifulSoup(html, 'html5lib')
             
     def get_page_content(self, url=None):
         """Extract text content from a page"""
@@ -82,14 +153,39 @@ class WebsiteExtractor:
         # Normalize whitespace
         return re.sub(r'\s+', ' ', text).strip()
     
+    def get_page_record(self, url=None):
+        """Fetch a page and return its text, outgoing links and fetch metadata"""
+        if url is None:
+            url = self.base_url
+        
+        soup = self._get_soup(url)
+        # Links first: get_page_content removes the script tags some extractors read
+        links = self._collect_links(soup, url) if soup else []
+        text = self.get_page_content(url) if soup else ""
+        info = self.fetch_log.get(url, {})
+        
+        return {
+            'url': url,
+            'fetched_at': info.get('fetched_at', datetime.now(timezone.utc)),
+            'status': info.get('status'),
+            'content_hash': hashlib.sha256(text.encode('utf-8')).hexdigest() if text else None,
+            'byte_size': info.get('bytes', 0),
+            'text': text,
+            'links': links
+        }
+    
     def extract_links(self, url=None):
         """Extract links using all available extractors"""
         soup = self._get_soup(url)
         if not soup:
             return []
-            
+        
+        self.all_links = self._collect_links(soup, url if url else self.base_url)
+        return self.all_links
+    
+    def _collect_links(self, soup, current_url):
+        """Run all extractors on a parsed page and return unique absolute URLs"""
         links = set()
-        current_url = url if url else self.base_url
         
         # Run all extractors
         extractors = [
@@ -116,8 +212,7 @@ class WebsiteExtractor:
             except ValueError as e:
                 logging.warning(f"Skipping invalid URL: {link}, Error: {e}")
         
-        self.all_links = list(set(absolute_links))
-        return self.all_links
+        return list(set(absolute_links))
     
     def _extract_a_tags(self, soup):
         """Enhanced extractor for <a> tags, including navigation menus"""
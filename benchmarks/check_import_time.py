@@ -0,0 +1,101 @@
+# check_import_time.py
+"""
+Import-time regression check.
+
+Imports each app module in a fresh interpreter with ``python -X importtime``
+and fails if a module pulls in a stack it should only load lazily (Gemini
+SDK, scraping stack, pandas, Streamlit) or exceeds its time budget.
+
+Usage:
+    python benchmarks/check_import_time.py [--budget-scale 2.0]
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+
+LLM_STACK = ["google.generativeai", "grpc"]
+SCRAPING_STACK = ["requests", "bs4", "html5lib"]
+DATA_STACK = ["pandas", "pyarrow"]
+
+# Module -> (packages it must not import, cumulative import budget in ms)
+CHECKS = {
+    "config": (["streamlit"] + LLM_STACK + SCRAPING_STACK + DATA_STACK, 150),
+    "llm_client": (["streamlit"] + LLM_STACK, 150),
+    "summarizer": (["streamlit"] + LLM_STACK + SCRAPING_STACK, 150),
+    "comparator": (["streamlit"] + LLM_STACK + SCRAPING_STACK, 150),
+    "profile_extractor": (["streamlit"] + LLM_STACK + SCRAPING_STACK, 150),
+    "corpus_store": (["streamlit"] + DATA_STACK, 150),
+    "search_index": (["streamlit"] + DATA_STACK + SCRAPING_STACK, 150),
+    # The Streamlit app itself needs streamlit, but nothing else heavy until a cache miss
+    "main": (LLM_STACK + SCRAPING_STACK + DATA_STACK, 600),
+}
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\| (\s*)(\S+)")
+
+def profile_import(module):
+    """
+    Import a module in a fresh interpreter and parse the -X importtime output.
+
+    Returns:
+        Tuple (set of imported module names, cumulative microseconds of the module)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=APP_DIR, capture_output=True, text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    imported = set()
+    cumulative_us = 0
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        imported.add(name)
+        if name == module and not match.group(3):
+            cumulative_us = int(match.group(2))
+    return imported, cumulative_us
+
+def check(budget_scale=1.0):
+    """Run every check and return a list of failure messages"""
+    failures = []
+    for module, (forbidden, budget_ms) in CHECKS.items():
+        try:
+            imported, cumulative_us = profile_import(module)
+        except RuntimeError as e:
+            failures.append(str(e))
+            continue
+
+        leaked = sorted(
+            name for name in imported
+            if any(name == pkg or name.startswith(pkg + ".") for pkg in forbidden)
+        )
+        elapsed_ms = cumulative_us / 1000
+        print(f"{module:<20} {elapsed_ms:8.1f} ms  {len(imported):4d} modules")
+
+        if leaked:
+            failures.append(f"{module} imports {', '.join(leaked[:5])} at import time")
+        if elapsed_ms > budget_ms * budget_scale:
+            failures.append(f"{module} took {elapsed_ms:.1f} ms to import (budget {budget_ms * budget_scale:.0f} ms)")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time regression check")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="Multiply every time budget, e.g. on slow CI machines")
+    args = parser.parse_args()
+
+    failures = check(args.budget_scale)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
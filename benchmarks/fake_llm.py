@@ -0,0 +1,129 @@
+# fake_llm.py
+"""
+Stand-in for google.generativeai with configurable latency and token accounting.
+
+FakeLLM.install() registers a fake ``google.generativeai`` module and clears
+llm_client's caches, so summarizer, profile_extractor and comparator run
+unchanged against it. Token counts use the ~4 characters per token heuristic.
+"""
+import sys
+import json
+import time
+import types
+import threading
+
+def count_tokens(text):
+    return max(1, len(text) // 4)
+
+class FakeResponse:
+    def __init__(self, text, prompt_tokens, output_tokens):
+        self.text = text
+        self.usage_metadata = types.SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens
+        )
+
+class FakeModel:
+    def __init__(self, llm, model_name=None, generation_config=None):
+        self.llm = llm
+        self.model_name = model_name
+        self.generation_config = generation_config or {}
+
+    def generate_content(self, prompt):
+        return self.llm.generate(prompt, self.generation_config)
+
+class FakeLLM:
+    """
+    Deterministic LLM whose latency grows with prompt and output size.
+
+    latency = base_latency_ms + prompt_tokens/1000 * ms_per_1k_prompt_tokens
+              + output_tokens * ms_per_output_token
+
+    Summaries produce summary_tokens and every other call output_tokens, both
+    capped at the call's max_output_tokens. Summary calls are recognized by
+    top_k, which only the summarizer sets.
+    """
+
+    def __init__(self, base_latency_ms=300.0, ms_per_1k_prompt_tokens=40.0,
+                 ms_per_output_token=1.0, output_tokens=400, summary_tokens=1024):
+        self.base_latency_ms = base_latency_ms
+        self.ms_per_1k_prompt_tokens = ms_per_1k_prompt_tokens
+        self.ms_per_output_token = ms_per_output_token
+        self.output_tokens = output_tokens
+        self.summary_tokens = summary_tokens
+        self.lock = threading.Lock()
+        self.calls = []
+
+    def install(self):
+        """Replace google.generativeai for this process"""
+        module = types.ModuleType("google.generativeai")
+        module.configure = lambda **kwargs: None
+        module.GenerativeModel = lambda **kwargs: FakeModel(self, **kwargs)
+
+        if "google" not in sys.modules:
+            try:
+                import google  # noqa: F401
+            except ImportError:
+                package = types.ModuleType("google")
+                package.__path__ = []
+                sys.modules["google"] = package
+        sys.modules["google.generativeai"] = module
+        setattr(sys.modules["google"], "generativeai", module)
+
+        import llm_client
+        llm_client._configured_genai.cache_clear()
+        llm_client._cached_model.cache_clear()
+        return self
+
+    def generate(self, prompt, generation_config):
+        target = self.summary_tokens if "top_k" in generation_config else self.output_tokens
+        output_tokens = min(target, generation_config.get("max_output_tokens", target))
+
+        if generation_config.get("response_mime_type") == "application/json":
+            text = self._profile_json(output_tokens)
+        else:
+            text = "cobertura seguro " * output_tokens
+        # Cut at the output cap (~4 characters per token, matching count_tokens), as
+        # the real model does; a profile that does not fit becomes invalid JSON
+        text = text[:output_tokens * 4]
+        prompt_tokens = count_tokens(prompt)
+        output_tokens = count_tokens(text)
+
+        latency_ms = (
+            self.base_latency_ms
+            + prompt_tokens / 1000 * self.ms_per_1k_prompt_tokens
+            + output_tokens * self.ms_per_output_token
+        )
+        time.sleep(latency_ms / 1000)
+
+        with self.lock:
+            self.calls.append({
+                "prompt_tokens": prompt_tokens,
+                "output_tokens": output_tokens,
+                "latency_ms": latency_ms,
+                "json": generation_config.get("response_mime_type") == "application/json"
+            })
+        return FakeResponse(text, prompt_tokens, output_tokens)
+
+    def _profile_json(self, output_tokens):
+        """Profile with as many items as fit in output_tokens, added round-robin per field"""
+        from profile_extractor import PROFILE_FIELDS
+        from config import PROFILE_MAX_ITEMS
+        perfil = {field: [] for field in PROFILE_FIELDS}
+        for i in range(PROFILE_MAX_ITEMS):
+            for field in PROFILE_FIELDS:
+                perfil[field].append(f"{field} {i + 1} " + " ".join([field] * 6))
+                # Compare characters, not count_tokens(), so the cut in generate() never splits the JSON
+                if len(json.dumps(perfil, ensure_ascii=False)) > output_tokens * 4:
+                    perfil[field].pop()
+                    return json.dumps(perfil, ensure_ascii=False)
+        return json.dumps(perfil, ensure_ascii=False)
+
+    def totals(self):
+        with self.lock:
+            return {
+                "llm_calls": len(self.calls),
+                "prompt_tokens": sum(call["prompt_tokens"] for call in self.calls),
+                "output_tokens": sum(call["output_tokens"] for call in self.calls),
+            }
@@ -0,0 +1,149 @@
+# fixture_server.py
+"""
+Local HTTP servers that replay insurer website snapshots.
+
+Each insurer is served on its own port so the extractor's same-domain
+filtering works as it does against the real sites. Latency and error
+injection are configurable and seeded, so runs are reproducible.
+
+Snapshot format (benchmarks/fixtures/<id>.json, written by record_snapshots.py):
+    {"id": ..., "nombre": ..., "pages": {"/path": {"status": 200,
+     "content_type": "text/html; charset=utf-8", "body": "<html>..."}}}
+"""
+import os
+import json
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+WORDS = (
+    "seguro cobertura póliza siniestro asistencia auto hogar vida granizo cristales "
+    "robo incendio responsabilidad civil franquicia prima asegurado productor cotizar "
+    "app móvil autogestión denuncia grúa reintegro comercio consorcio caución agro "
+    "accidentes personales sepelio retiro atención cliente whatsapp sucursal online"
+).split()
+
+SECTIONS = ["seguros", "productos", "coberturas", "siniestros", "empresas", "personas"]
+
+def synthetic_snapshot(insurer_id, nombre, pages=25, paragraphs=12, seed=0):
+    """
+    Build a deterministic insurer site when no recorded snapshot is available.
+
+    Includes navigation links, product pages, a script-embedded link and a
+    link that serves a PDF, so content-type gating is exercised too.
+    """
+    rng = random.Random(f"{insurer_id}-{seed}")
+    paths = [f"/{SECTIONS[i % len(SECTIONS)]}/{insurer_id}-{i}" for i in range(pages)]
+
+    def body(title, links):
+        texto = "".join(
+            f"<p>{' '.join(rng.choice(WORDS) for _ in range(rng.randint(40, 90)))}.</p>"
+            for _ in range(paragraphs)
+        )
+        nav = "".join(f'<li><a href="{link}">{link.rsplit("/", 1)[-1]}</a></li>' for link in links)
+        return (
+            f"<html><head><meta charset=\"utf-8\"><title>{nombre} - {title}</title>"
+            f"<style>body {{ font-family: sans-serif; }}</style></head>"
+            f"<body><nav><ul>{nav}</ul></nav><main><h1>{title}</h1>{texto}</main>"
+            f"<script>var legales = \"/legales/{insurer_id}.html\";</script></body></html>"
+        )
+
+    html = "text/html; charset=utf-8"
+    snapshot = {
+        "/": {"status": 200, "content_type": html,
+              "body": body(nombre, paths + ["/descargas/poliza-tipo"])},
+        f"/legales/{insurer_id}.html": {"status": 200, "content_type": html,
+                                        "body": body("Legales", ["/"])},
+        "/descargas/poliza-tipo": {"status": 200, "content_type": "application/pdf",
+                                   "body": "%PDF-1.4 " + "0" * 4_000},
+    }
+    for path in paths:
+        snapshot[path] = {"status": 200, "content_type": html,
+                          "body": body(path.rsplit("/", 1)[-1], ["/", rng.choice(paths)])}
+    return {"id": insurer_id, "nombre": nombre, "pages": snapshot}
+
+def load_snapshot(insurer_id, nombre, pages=25):
+    """Recorded snapshot from FIXTURES_DIR if present, synthetic otherwise"""
+    path = os.path.join(FIXTURES_DIR, f"{insurer_id}.json")
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return synthetic_snapshot(insurer_id, nombre, pages=pages)
+
+class ReplayServer:
+    """Serve one snapshot on 127.0.0.1 with injected latency and errors"""
+
+    def __init__(self, snapshot, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, seed=0):
+        self.snapshot = snapshot
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.seed = seed
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.requests_by_path = {}
+        self.connections = 0  # TCP connections accepted, to check the client's stats
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                # One handler per accepted connection
+                with server.lock:
+                    server.connections += 1
+                super().setup()
+
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_port}/"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def handle(self, request):
+        path = urlparse(request.path).path or "/"
+        with self.lock:
+            self.requests += 1
+            attempt = self.requests_by_path[path] = self.requests_by_path.get(path, 0) + 1
+        # Seeded per path and attempt, so the same requests fail whatever the thread order
+        rng = random.Random(f"{self.snapshot['id']}-{self.seed}-{path}-{attempt}")
+        delay = self.latency_ms + rng.uniform(0, self.jitter_ms)
+        # The home page never fails, so every run crawls the same link set
+        fail = path != "/" and rng.random() < self.error_rate
+        time.sleep(delay / 1000)
+
+        page = self.snapshot["pages"].get(path)
+        if fail:
+            status, content_type, body = 503, "text/plain", b"Service Unavailable"
+        elif page is None:
+            status, content_type, body = 404, "text/plain", b"Not Found"
+        else:
+            status, content_type = page["status"], page["content_type"]
+            body = page["body"].encode("utf-8")
+
+        request.send_response(status)
+        request.send_header("Content-Type", content_type)
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
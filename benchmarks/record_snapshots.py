@@ -0,0 +1,96 @@
+# record_snapshots.py
+"""
+Record live insurer websites as replayable benchmark fixtures.
+
+Fetches the home page and up to --pages filtered links of each insurer with
+the app's own extractor and transport, and writes benchmarks/fixtures/<id>.json
+for fixture_server.py. Absolute links to the insurer's own host are rewritten
+as root-relative, so the replayed site links to itself.
+
+Usage:
+    python benchmarks/record_snapshots.py fedpat sancor galicia --pages 25
+"""
+import os
+import sys
+import json
+import logging
+import argparse
+from urllib.parse import urlparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "app"))
+
+from fixture_server import FIXTURES_DIR
+
+def record(aseguradora, max_pages):
+    """Download an insurer site and return it in snapshot format"""
+    from website_extractor import WebsiteExtractor
+    from http_transport import get_transport
+    from config import MAX_RESPONSE_BYTES, STREAM_CHUNK_SIZE
+
+    extractor = WebsiteExtractor(aseguradora["url"])
+    extractor.extract_links()
+    urls = [aseguradora["url"]] + extractor.filter_links()[:max_pages]
+
+    origin = urlparse(aseguradora["url"])
+    hosts = {origin.netloc, origin.netloc[4:] if origin.netloc.startswith("www.") else f"www.{origin.netloc}"}
+
+    pages = {}
+    for url in urls:
+        parsed = urlparse(url)
+        path = parsed.path or "/"
+        if path in pages:
+            continue
+        try:
+            with get_transport().stream(url) as response:
+                content_type = response.headers.get("Content-Type", "")
+                body = bytearray()
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    body.extend(chunk)
+                    if len(body) > MAX_RESPONSE_BYTES:
+                        break
+                status = response.status_code
+        except Exception as e:
+            logging.error(f"Error recording {url}: {e}")
+            continue
+
+        mime_type = content_type.split(";")[0].strip().lower()
+        if mime_type in ("text/html", "application/xhtml+xml"):
+            text = bytes(body).decode(extractor._detect_encoding(content_type, body), errors="replace")
+            for host in hosts:
+                for scheme in ("https", "http"):
+                    text = text.replace(f"{scheme}://{host}", "")
+            # The replay server always sends UTF-8
+            pages[path] = {"status": status, "content_type": f"{mime_type}; charset=utf-8", "body": text}
+        else:
+            # Keep only the headers of non-HTML responses; the fetcher rejects them before the body
+            pages[path] = {"status": status, "content_type": content_type, "body": ""}
+
+    return {"id": aseguradora["id"], "nombre": aseguradora["nombre"], "pages": pages}
+
+def main():
+    parser = argparse.ArgumentParser(description="Record insurer websites as benchmark fixtures")
+    parser.add_argument("ids", nargs="+", help="Insurer ids from aseguradoras.json")
+    parser.add_argument("--pages", type=int, default=25, help="Maximum pages per insurer")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    os.chdir(REPO_DIR)  # config paths are relative to the repository root
+
+    with open(os.path.join("app", "data", "aseguradoras.json"), "r", encoding="utf-8") as f:
+        aseguradoras = {aseg["id"]: aseg for aseg in json.load(f)}
+
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for insurer_id in args.ids:
+        if insurer_id not in aseguradoras:
+            logging.error(f"Unknown insurer id: {insurer_id}")
+            continue
+        snapshot = record(aseguradoras[insurer_id], args.pages)
+        path = os.path.join(FIXTURES_DIR, f"{insurer_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        logging.info(f"Recorded {len(snapshot['pages'])} pages of {insurer_id} in {path}")
+
+if __name__ == "__main__":
+    main()
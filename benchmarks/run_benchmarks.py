@@ -0,0 +1,324 @@
+# run_benchmarks.py
+"""
+End-to-end offline benchmarks for the crawl, summary and comparison pipeline.
+
+Insurer sites are replayed from local snapshots (see fixture_server.py) and
+Gemini is replaced by FakeLLM, so runs need no network and no API key. Each
+scenario runs in a fresh process, so peak RSS and import costs are measured
+per scenario:
+
+    cold_crawl         crawl, store and summarize every insurer from scratch
+    warm_cache         the same with corpus and summaries already stored
+    single_comparison  profile two insurers and compare them
+    all_pairs          profile every insurer and compare every pair
+
+Usage:
+    python benchmarks/run_benchmarks.py --save-baseline
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/baseline.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import itertools
+import traceback
+import multiprocessing
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+APP_DIR = os.path.join(REPO_DIR, "app")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+
+sys.path.insert(0, APP_DIR)
+# The fake LLM never uses it, but the summarizer refuses to run without a key
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-fake-key")
+
+from corpus_store import CorpusStore
+from config import SUMMARY_MAX_TOKENS
+
+SCENARIOS = ["cold_crawl", "warm_cache", "single_comparison", "all_pairs"]
+
+# Metrics checked against the baseline
+LOWER_IS_BETTER = ["wall_s", "p50_ms", "p95_ms", "peak_rss_mb", "llm_calls", "prompt_tokens", "output_tokens"]
+HIGHER_IS_BETTER = ["throughput_per_s"]
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+def peak_rss_mb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+class CountingCorpusStore(CorpusStore):
+    """CorpusStore that counts the pages appended, without reading the corpus back"""
+
+    def __init__(self, base_dir):
+        super().__init__(base_dir)
+        self.pages_appended = 0
+
+    def append(self, insurer_id, pages):
+        self.pages_appended += len(pages)
+        return super().append(insurer_id, pages)
+
+class Pipeline:
+    """The app's pipeline (app/pipeline.py) bound to a benchmark work directory"""
+
+    def __init__(self, workdir, max_chars):
+        from search_index import SearchIndex
+
+        self.max_chars = max_chars
+        self.corpus = CountingCorpusStore(os.path.join(workdir, "corpus"))
+        self.index = SearchIndex(os.path.join(workdir, "search_index.db"))
+        self.summaries_dir = os.path.join(workdir, "summaries")
+        self.profiles_dir = os.path.join(workdir, "profiles")
+        self.profile_fallbacks = 0
+
+    def summary(self, aseguradora):
+        from pipeline import obtener_resumen
+        return obtener_resumen(aseguradora, self.max_chars, self.corpus, self.index, self.summaries_dir)
+
+    def compare(self, cia1, cia2, mode):
+        resumen1, resumen2 = self.summary(cia1), self.summary(cia2)
+        if mode == "summaries":
+            from comparator import compare_insurance_companies
+            return compare_insurance_companies(resumen1, resumen2, cia1["nombre"], cia2["nombre"])
+        from pipeline import generar_comparativa
+        comparativa, con_perfiles = generar_comparativa(cia1, resumen1, cia2, resumen2, self.profiles_dir)
+        if not con_perfiles:
+            # An invalid profile made the app fall back to the full summaries
+            self.profile_fallbacks += 1
+        return comparativa
+
+def _run_scenario(name, insurers, workdir, options, queue):
+    """Run one scenario in a child process and put its metrics on the queue"""
+    try:
+        os.chdir(REPO_DIR)  # config paths are relative to the repository root
+        logging.basicConfig(level=logging.WARNING)
+
+        from fake_llm import FakeLLM
+        llm = FakeLLM(
+            base_latency_ms=options["llm_latency_ms"],
+            ms_per_1k_prompt_tokens=options["llm_ms_per_1k_prompt_tokens"],
+            ms_per_output_token=options["llm_ms_per_output_token"],
+            output_tokens=options["llm_output_tokens"],
+            summary_tokens=options["llm_summary_tokens"],
+        ).install()
+        pipeline = Pipeline(workdir, options["max_chars"])
+
+        if name in ("single_comparison", "all_pairs"):
+            # Measure profile extraction as part of the comparison cost
+            shutil.rmtree(pipeline.profiles_dir, ignore_errors=True)
+
+        if name in ("prepare", "cold_crawl", "warm_cache"):
+            operations = [lambda a=a: pipeline.summary(a) for a in insurers]
+        elif name == "single_comparison":
+            operations = [lambda: pipeline.compare(insurers[0], insurers[1], options["comparison"])]
+        else:
+            operations = [
+                lambda a=a, b=b: pipeline.compare(a, b, options["comparison"])
+                for a, b in itertools.combinations(insurers, 2)
+            ]
+
+        latencies = []
+        start = time.perf_counter()
+        for operation in operations:
+            op_start = time.perf_counter()
+            operation()
+            latencies.append((time.perf_counter() - op_start) * 1000)
+        wall = time.perf_counter() - start
+        pages_fetched = pipeline.corpus.pages_appended
+
+        result = {
+            "ops": len(operations),
+            "wall_s": round(wall, 4),
+            "throughput_per_s": round(len(operations) / wall, 4) if wall else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "pages_fetched": pages_fetched,
+            "profile_fallbacks": pipeline.profile_fallbacks,
+            **llm.totals(),
+        }
+        if pages_fetched:
+            from http_transport import get_transport
+            stats = get_transport().stats().values()
+            result["http_requests"] = sum(s["requests"] for s in stats)
+            result["http_connections"] = sum(s["connections"] for s in stats)
+            result["http_connections_reused"] = sum(s["reused"] for s in stats)
+        queue.put(result)
+    except Exception:
+        queue.put({"error": traceback.format_exc()})
+
+def load_insurers(count):
+    with open(os.path.join(APP_DIR, "data", "aseguradoras.json"), "r", encoding="utf-8") as f:
+        return json.load(f)[:count]
+
+def compare_to_baseline(report, baseline, threshold):
+    """
+    Compare scenario metrics against a baseline report.
+
+    Returns:
+        List of regression messages (empty if none)
+    """
+    regressions = []
+    if baseline.get("options") != report.get("options"):
+        print("WARNING: baseline was recorded with different options; comparison may be misleading")
+
+    for name, current in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or "error" in current or "error" in previous:
+            continue
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            if metric not in current or not previous.get(metric):
+                continue
+            change = (current[metric] - previous[metric]) / previous[metric]
+            worse = change > threshold if metric in LOWER_IS_BETTER else change < -threshold
+            marker = "REGRESSION" if worse else ""
+            print(f"  {name:<18} {metric:<17} {previous[metric]:>12} -> {current[metric]:>12} ({change:+.1%}) {marker}")
+            if worse:
+                regressions.append(f"{name}.{metric}: {previous[metric]} -> {current[metric]} ({change:+.1%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmarks")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--insurers", type=int, default=4, help="Insurers taken from aseguradoras.json")
+    parser.add_argument("--pages", type=int, default=25, help="Pages per synthetic site")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Server latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Share of requests answered with 503")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--llm-ms-per-1k-prompt-tokens", type=float, default=40.0)
+    parser.add_argument("--llm-ms-per-output-token", type=float, default=1.0)
+    parser.add_argument("--llm-output-tokens", type=int, default=400, help="Output of profile and comparison calls")
+    parser.add_argument("--llm-summary-tokens", type=int, default=SUMMARY_MAX_TOKENS, help="Output of summary calls")
+    parser.add_argument("--max-chars", type=int, default=60000)
+    parser.add_argument("--comparison", choices=["profiles", "summaries"], default="profiles")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"))
+    parser.add_argument("--baseline", help="Baseline report to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Also write the report to {DEFAULT_BASELINE}")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative change before a regression")
+    args = parser.parse_args()
+
+    if args.insurers < 2:
+        parser.error("--insurers must be at least 2")
+
+    from fixture_server import ReplayServer, load_snapshot
+
+    options = {
+        key: getattr(args, key) for key in (
+            "insurers", "pages", "latency_ms", "jitter_ms", "error_rate",
+            "llm_latency_ms", "llm_ms_per_1k_prompt_tokens", "llm_ms_per_output_token",
+            "llm_output_tokens", "llm_summary_tokens", "max_chars", "comparison", "seed"
+        )
+    }
+
+    servers = []
+    insurers = []
+    for aseguradora in load_insurers(args.insurers):
+        snapshot = load_snapshot(aseguradora["id"], aseguradora["nombre"], pages=args.pages)
+        server = ReplayServer(
+            snapshot, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate, seed=args.seed
+        ).start()
+        servers.append(server)
+        insurers.append({"id": aseguradora["id"], "nombre": aseguradora["nombre"], "url": server.base_url})
+
+    workdir = tempfile.mkdtemp(prefix="insurance-bench-")
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    def run_in_child(name):
+        accepted_before = sum(server.connections for server in servers)
+        queue = context.Queue()
+        process = context.Process(target=_run_scenario, args=(name, insurers, workdir, options, queue))
+        process.start()
+        result = queue.get()
+        process.join()
+        if "http_connections" in result:
+            # The transport's connection count must match what the servers accepted
+            result["server_connections"] = sum(server.connections for server in servers) - accepted_before
+        return result
+
+    try:
+        if "cold_crawl" not in args.scenarios:
+            # Comparisons and warm runs need stored summaries; build them untimed in
+            # a separate process so the setup does not count toward their peak RSS
+            prepared = run_in_child("prepare")
+            if "error" in prepared:
+                print(f"prepare: FAILED\n{prepared['error']}")
+                sys.exit(1)
+
+        for name in SCENARIOS:
+            if name not in args.scenarios:
+                continue
+            results[name] = result = run_in_child(name)
+            if "error" in result:
+                print(f"{name}: FAILED\n{result['error']}")
+                continue
+            print(
+                f"{name:<18} {result['ops']:>3} ops  {result['wall_s']:>8.2f} s  "
+                f"p50 {result['p50_ms']:>9.1f} ms  p95 {result['p95_ms']:>9.1f} ms  "
+                f"rss {result['peak_rss_mb']:>6.1f} MB  tokens {result['prompt_tokens']}+{result['output_tokens']}"
+            )
+            if result["profile_fallbacks"]:
+                print(f"WARNING: {name} fell back to full-summary comparisons {result['profile_fallbacks']} times")
+    finally:
+        for server in servers:
+            server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": options,
+        "scenarios": results,
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        with open(DEFAULT_BASELINE, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {DEFAULT_BASELINE}")
+
+    failed = any("error" in result for result in results.values())
+    for name, result in results.items():
+        if "http_connections" in result and result["http_connections"] != result["server_connections"]:
+            print(f"CONNECTION STATS MISMATCH: {name} reported {result['http_connections']} connections, "
+                  f"the servers accepted {result['server_connections']}")
+            failed = True
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"Comparison against {args.baseline} (threshold {args.threshold:.0%}):")
+        regressions = compare_to_baseline(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        failed = failed or bool(regressions)
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()